@@ -2,22 +2,28 @@
 from __future__ import annotations
 
 import os
-from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, List
+from typing import Annotated, Any, Dict
 
-from fastapi import FastAPI, Form, HTTPException, Request, status
+from fastapi import BackgroundTasks, FastAPI, Form, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel, Field
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from pydantic import BaseModel, ConfigDict, Field
 
+from cross_sell._fastdict import record_asdict
 from cross_sell.config import LakehousePaths
 from cross_sell.data.ingestion import ProductRecord
 from cross_sell.service.product_store import ProductStore
 from cross_sell.service.recommendation_index import RecommendationIndex
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional accelerator
+    orjson = None  # type: ignore[assignment]
+
 
 def _resolve_store_path() -> Path:
     configured = os.environ.get("PRODUCT_STORE_PATH")
@@ -33,7 +39,36 @@ def _resolve_lakehouse_root() -> Path:
     return Path(".lakehouse_ui_demo")
 
 
-app = FastAPI(title="Cross-Sell Product Admin")
+def _build_template_env() -> Environment:
+    """Compile templates once per process and persist their bytecode across restarts.
+
+    Template files are not re-checked on every render unless
+    ``TEMPLATE_AUTO_RELOAD=1`` is set for local template development.
+    """
+
+    cache_dir = os.environ.get("TEMPLATE_CACHE_DIR")
+    return Environment(
+        loader=FileSystemLoader("app/templates"),
+        autoescape=True,
+        bytecode_cache=FileSystemBytecodeCache(cache_dir) if cache_dir else FileSystemBytecodeCache(),
+        auto_reload=os.environ.get("TEMPLATE_AUTO_RELOAD") == "1",
+    )
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by orjson when available.
+
+    API handlers return this directly so FastAPI skips ``jsonable_encoder`` and
+    response-model validation for payloads that are already plain dicts.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
+
+
+app = FastAPI(title="Cross-Sell Product Admin", default_response_class=FastJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -41,13 +76,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-templates = Jinja2Templates(directory="app/templates")
+templates = Jinja2Templates(env=_build_template_env())
+templates.get_template("index.html")  # pre-compile so the first request skips parsing
 store = ProductStore(_resolve_store_path())
 lakehouse_paths = LakehousePaths(_resolve_lakehouse_root())
 recommendation_index = RecommendationIndex(lakehouse_paths)
 
 
 class ProductPayload(BaseModel):
+    # Strip once during validation so length constraints apply to the stored value.
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     product_id: str = Field(..., min_length=1, max_length=64)
     name: str = Field(..., min_length=1, max_length=256)
     category: str = Field(..., min_length=1, max_length=256)
@@ -56,39 +95,31 @@ class ProductPayload(BaseModel):
     base_price: float = Field(default=0.0, ge=0.0)
 
     def to_record(self) -> ProductRecord:
-        return ProductRecord(
-            product_id=self.product_id.strip(),
-            name=self.name.strip(),
-            category=self.category.strip(),
-            subcategory=self.subcategory.strip(),
-            brand=self.brand.strip(),
-            base_price=float(self.base_price),
-        )
+        return ProductRecord(**self.__dict__)
 
 
 def _serialize_product(record: ProductRecord) -> Dict[str, object]:
-    return asdict(record)
+    return record_asdict(record)
 
 
 @app.get("/")
 def index(request: Request):
     return templates.TemplateResponse(
+        request,
         "index.html",
-        {
-            "request": request,
-            "products": store.list_products(),
-        },
+        {"products": store.list_products()},
     )
 
 
-@app.post("/products")
+@app.post("/products", response_model=None)
 async def create_product(
-    product_id: str = Form(...),
-    name: str = Form(...),
-    category: str = Form(...),
-    subcategory: str = Form(""),
-    brand: str = Form(""),
-    base_price: float = Form(0.0),
+    background_tasks: BackgroundTasks,
+    product_id: Annotated[str, Form()],
+    name: Annotated[str, Form()],
+    category: Annotated[str, Form()],
+    subcategory: Annotated[str, Form()] = "",
+    brand: Annotated[str, Form()] = "",
+    base_price: Annotated[float, Form()] = 0.0,
 ):  # pragma: no cover - exercised via API tests
     store.upsert(
         ProductRecord(
@@ -98,31 +129,45 @@ async def create_product(
             subcategory=subcategory.strip(),
             brand=brand.strip(),
             base_price=float(base_price),
-        )
+        ),
+        flush=False,
     )
+    background_tasks.add_task(store.flush)
     return RedirectResponse(url="/", status_code=status.HTTP_303_SEE_OTHER)
 
 
-@app.get("/api/products")
-def api_list_products() -> List[Dict[str, object]]:
-    return [_serialize_product(product) for product in store.list_products()]
+@app.get("/api/products", response_model=None)
+def api_list_products() -> FastJSONResponse:
+    return FastJSONResponse([_serialize_product(product) for product in store.list_products()])
 
 
-@app.post("/api/products", status_code=status.HTTP_201_CREATED)
-def api_create_product(payload: ProductPayload) -> Dict[str, object]:
-    record = store.upsert(payload.to_record())
-    return _serialize_product(record)
+@app.post("/api/products", status_code=status.HTTP_201_CREATED, response_model=None)
+def api_create_product(payload: ProductPayload, background_tasks: BackgroundTasks) -> FastJSONResponse:
+    record = store.upsert(payload.to_record(), flush=False)
+    background_tasks.add_task(store.flush)
+    return FastJSONResponse(_serialize_product(record), status_code=status.HTTP_201_CREATED)
 
 
-@app.get("/api/recommendations/{product_id}")
-def api_recommendations(product_id: str, limit: int = 5) -> Dict[str, object]:
+@app.get("/api/recommendations/{product_id}", response_model=None)
+def api_recommendations(product_id: str, limit: int = 5) -> FastJSONResponse:
     if limit <= 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="limit must be positive",
         )
     recommendations = recommendation_index.recommendations_for(product_id, limit)
-    return {"product_id": product_id, "recommendations": recommendations}
+    return FastJSONResponse({"product_id": product_id, "recommendations": recommendations})
+
+
+@app.get("/api/rules/{product_id}", response_model=None)
+def api_rules(product_id: str, limit: int = 5) -> FastJSONResponse:
+    if limit <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit must be positive",
+        )
+    rules = recommendation_index.rules_for(product_id, limit)
+    return FastJSONResponse({"product_id": product_id, "rules": rules})
 
 
 # Optional mount point for static assets if teams expand the UI.
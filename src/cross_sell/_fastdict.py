@@ -0,0 +1,29 @@
+"""Generated ``asdict`` replacements for flat record dataclasses."""
+from __future__ import annotations
+
+from dataclasses import fields
+from typing import Any, Callable, Dict
+
+_CONVERTERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def make_asdict(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    """Compile ``lambda r: {"field": r.field, ...}`` for ``cls``.
+
+    Unlike :func:`dataclasses.asdict` this neither recurses nor deep-copies
+    values, which is only correct for dataclasses whose fields are scalars.
+    """
+
+    names = [field.name for field in fields(cls)]
+    source = "lambda r: {" + ", ".join(f"{name!r}: r.{name}" for name in names) + "}"
+    return eval(source, {})  # noqa: S307 - source is built from dataclass field names only
+
+
+def record_asdict(record: Any) -> Dict[str, Any]:
+    """Convert a flat dataclass instance to a dict using a per-class cached converter."""
+
+    cls = type(record)
+    converter = _CONVERTERS.get(cls)
+    if converter is None:
+        converter = _CONVERTERS[cls] = make_asdict(cls)
+    return converter(record)
@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
+from typing import ClassVar, Set
 
 
 @dataclass
@@ -14,12 +16,18 @@ class LakehousePaths:
     silver: Path = field(init=False)
     gold: Path = field(init=False)
 
+    # Roots whose zone directories were already created by this process.
+    _initialized_roots: ClassVar[Set[Path]] = set()
+
     def __post_init__(self) -> None:
         self.bronze = self.root / "bronze"
         self.silver = self.root / "silver"
         self.gold = self.root / "gold"
+        if self.root in self._initialized_roots:
+            return
         for path in (self.bronze, self.silver, self.gold):
             path.mkdir(parents=True, exist_ok=True)
+        self._initialized_roots.add(self.root)
 
 
 @dataclass
@@ -33,6 +41,10 @@ class ModelConfig:
     als_factors: int = 8
     als_regularization: float = 0.1
     als_iterations: int = 10
+    # iALS++-style subspace updates: solve factor dimensions one block at a time. No faster
+    # than the default shared-Gram solve for this unweighted ALS; kept for a weighted variant.
+    als_use_ialspp: bool = False
+    als_block_size: int = 128
 
 
 @dataclass
@@ -42,7 +54,10 @@ class PipelineConfig:
     lakehouse_root: Path
     orders_source: Path
     model: ModelConfig = field(default_factory=ModelConfig)
+    # When False, large gold tables are streamed straight to disk and left out of
+    # the returned artifacts instead of being held in memory as row lists.
+    keep_gold_rows: bool = True
 
-    @property
+    @cached_property
     def lakehouse(self) -> LakehousePaths:
         return LakehousePaths(self.lakehouse_root)
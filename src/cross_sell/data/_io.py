@@ -0,0 +1,99 @@
+"""JSON persistence helpers shared by the bronze/silver/gold writers."""
+from __future__ import annotations
+
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Sequence
+
+from .._fastdict import record_asdict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional accelerator
+    orjson = None  # type: ignore[assignment]
+
+
+def write_json(rows: Sequence[Any], target: Path, pretty: bool = True) -> Path:
+    """Write ``rows`` (dicts or flat dataclasses) as a JSON array.
+
+    orjson serializes dataclasses natively, so records are never copied into
+    intermediate dicts; the stdlib fallback converts them lazily via ``default``.
+    ``pretty=False`` emits compact JSON for machine-only intermediate tables.
+    """
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        target.write_bytes(orjson.dumps(rows, option=orjson.OPT_INDENT_2 if pretty else None))
+        return target
+    with target.open("w", encoding="utf-8") as handle:
+        if pretty:
+            json.dump(rows, handle, indent=2, default=record_asdict)
+        else:
+            json.dump(rows, handle, separators=(",", ":"), default=record_asdict)
+    return target
+
+
+def _dumps_row(row: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(row)
+    return json.dumps(row, separators=(",", ":"), ensure_ascii=False, default=record_asdict).encode("utf-8")
+
+
+def stream_json_rows(rows: Iterable[Any], target: Path) -> Path:
+    """Write ``rows`` as a JSON array with one compact object per line.
+
+    Rows are encoded and written one at a time, so peak memory is bounded by the
+    largest row rather than by the serialized size of the whole table, and
+    ``rows`` may be a generator.
+    """
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("wb") as handle:
+        separator = b"[\n  "
+        for row in rows:
+            handle.write(separator)
+            handle.write(_dumps_row(row))
+            separator = b",\n  "
+        handle.write(b"[]" if separator == b"[\n  " else b"\n]")
+    return target
+
+
+def read_json(path: Path) -> Any:
+    # Decode from bytes so both paths read the UTF-8 the writers emit, whatever the locale.
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_bytes())
+
+
+class WriteQueue:
+    """Run table writes in the background and wait for all of them at once.
+
+    Writers are submitted as they become ready so their serialization and disk
+    I/O overlap with the rest of the pipeline; :meth:`drain` blocks until every
+    submitted write has finished and re-raises the first failure.
+    """
+
+    def __init__(self, max_workers: int = 2) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lakehouse-write")
+        self._pending: List[Future] = []
+
+    def submit(self, writer: Callable[..., Path], *args: Any) -> None:
+        self._pending.append(self._executor.submit(writer, *args))
+
+    def drain(self) -> List[Path]:
+        pending, self._pending = self._pending, []
+        try:
+            return [future.result() for future in pending]
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "WriteQueue":
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, traceback: object) -> None:
+        if exc_type is None:
+            self.drain()
+        else:
+            # Let the original error propagate; just don't leave writer threads behind.
+            self._executor.shutdown(wait=True)
@@ -1,11 +1,11 @@
 """Utilities for producing gold-zone analytical outputs."""
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 from ..config import LakehousePaths
+from ._io import read_json, stream_json_rows
 
 
 GOLD_TABLES = {
@@ -15,21 +15,16 @@ GOLD_TABLES = {
 }
 
 
-def write_gold_table(rows: List[Dict[str, object]], lakehouse: LakehousePaths, table_name: str) -> Path:
+def write_gold_table(rows: Iterable[Dict[str, object]], lakehouse: LakehousePaths, table_name: str) -> Path:
     if table_name not in GOLD_TABLES:
         raise KeyError(f"Unsupported gold table: {table_name}")
-    target = lakehouse.gold / GOLD_TABLES[table_name]
-    target.parent.mkdir(parents=True, exist_ok=True)
-    with target.open("w") as handle:
-        json.dump(rows, handle, indent=2)
-    return target
+    return stream_json_rows(rows, lakehouse.gold / GOLD_TABLES[table_name])
 
 
 def load_gold_table(lakehouse: LakehousePaths, table_name: str) -> List[Dict[str, object]]:
     if table_name not in GOLD_TABLES:
         raise KeyError(f"Unsupported gold table: {table_name}")
-    with (lakehouse.gold / GOLD_TABLES[table_name]).open() as handle:
-        return json.load(handle)
+    return read_json(lakehouse.gold / GOLD_TABLES[table_name])
 
 
 def summarize_for_serving(lakehouse: LakehousePaths) -> Dict[str, List[Dict[str, object]]]:
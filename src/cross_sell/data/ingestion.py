@@ -2,16 +2,22 @@
 from __future__ import annotations
 
 import csv
-import json
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Iterable, List
+from sys import intern
+from typing import Iterator, List, Sequence, Tuple
 
 from ..config import LakehousePaths
+from ._io import read_json, write_json
 
 
+# Records are created once per source row, so they declare ``__slots__`` to
+# drop the per-instance ``__dict__`` (``dataclass(slots=True)`` needs 3.10+).
 @dataclass
 class OrderRecord:
+    __slots__ = ("order_id", "user_id", "product_id", "quantity", "unit_price", "order_ts", "sales_channel")
+
     order_id: str
     user_id: str
     product_id: str
@@ -21,36 +27,127 @@ class OrderRecord:
     sales_channel: str
 
 
-def read_orders_csv(path: Path) -> List[OrderRecord]:
-    records: List[OrderRecord] = []
-    with path.open() as handle:
-        reader = csv.DictReader(handle)
+@dataclass
+class ProductRecord:
+    __slots__ = ("product_id", "name", "category", "subcategory", "brand", "base_price")
+
+    product_id: str
+    name: str
+    category: str
+    subcategory: str
+    brand: str
+    base_price: float
+
+
+@dataclass
+class CustomerRecord:
+    __slots__ = ("user_id", "segment", "region", "loyalty_tier", "join_date")
+
+    user_id: str
+    segment: str
+    region: str
+    loyalty_tier: str
+    join_date: str
+
+
+_CSV_READ_BUFFER = 1 << 20
+
+
+def _iter_csv_rows(path: Path, columns: Sequence[str]) -> Iterator[Tuple[str, ...]]:
+    """Yield the requested columns of each CSV row as a positional tuple.
+
+    Column positions are resolved once from the header so rows are sliced with a
+    single C-level ``itemgetter`` call instead of building a dict per row. The
+    file is read through a 1 MiB buffer to keep read syscalls off the hot path.
+    """
+
+    with path.open(newline="", buffering=_CSV_READ_BUFFER) as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+        missing = [name for name in columns if name not in header]
+        if missing:
+            raise KeyError(f"{path} is missing columns: {', '.join(missing)}")
+        getter = itemgetter(*(header.index(name) for name in columns))
+        width = len(header)
         for row in reader:
-            records.append(
-                OrderRecord(
-                    order_id=row["order_id"],
-                    user_id=row["user_id"],
-                    product_id=row["product_id"],
-                    quantity=int(float(row["quantity"] or 0) or 0),
-                    unit_price=float(row["unit_price"] or 0.0),
-                    order_ts=row["order_ts"],
-                    sales_channel=row["sales_channel"],
-                )
-            )
-    return records
+            if not row:
+                continue
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            yield getter(row)
+
+
+def _parse_quantity(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value or 0) or 0)
+
+
+def read_orders_csv(path: Path) -> List[OrderRecord]:
+    columns = ("order_id", "user_id", "product_id", "quantity", "unit_price", "order_ts", "sales_channel")
+    # Low-cardinality columns are interned (here and in the readers below) so every record
+    # shares one string per distinct value and dict/set lookups hit the identity fast path.
+    return [
+        OrderRecord(
+            order_id=order_id,
+            user_id=intern(user_id),
+            product_id=intern(product_id),
+            quantity=_parse_quantity(quantity),
+            unit_price=float(unit_price or 0.0),
+            order_ts=order_ts,
+            sales_channel=intern(sales_channel),
+        )
+        for order_id, user_id, product_id, quantity, unit_price, order_ts, sales_channel in _iter_csv_rows(
+            path, columns
+        )
+    ]
+
+
+def read_products_csv(path: Path) -> List[ProductRecord]:
+    columns = ("product_id", "name", "category", "subcategory", "brand", "base_price")
+    return [
+        ProductRecord(
+            product_id=product_id,
+            name=name,
+            category=intern(category),
+            subcategory=intern(subcategory),
+            brand=intern(brand),
+            base_price=float(base_price or 0.0),
+        )
+        for product_id, name, category, subcategory, brand, base_price in _iter_csv_rows(path, columns)
+    ]
+
+
+def read_customers_csv(path: Path) -> List[CustomerRecord]:
+    columns = ("user_id", "segment", "region", "loyalty_tier", "join_date")
+    return [
+        CustomerRecord(user_id, intern(segment), intern(region), intern(loyalty_tier), join_date)
+        for user_id, segment, region, loyalty_tier, join_date in _iter_csv_rows(path, columns)
+    ]
+
+
+def order_columns(records: Sequence[OrderRecord], *names: str) -> Tuple[Tuple[object, ...], ...]:
+    """Column-wise (structure-of-arrays) view of ``records`` for the requested fields.
+
+    Records stay row objects everywhere else; this transposes the requested
+    attributes in one C-level ``attrgetter``/``zip`` pass for scans that only
+    touch a few columns, e.g. ``user_ids, quantities = order_columns(orders, "user_id", "quantity")``.
+    """
+    if len(names) == 1:
+        return (tuple(map(attrgetter(names[0]), records)),)
+    return tuple(zip(*map(attrgetter(*names), records))) or tuple(() for _ in names)
 
 
 def _write_json(records: List[OrderRecord], target: Path) -> Path:
-    target.parent.mkdir(parents=True, exist_ok=True)
-    with target.open("w") as handle:
-        json.dump([asdict(record) for record in records], handle, indent=2)
-    return target
+    # Bronze/silver tables are only read back by the pipeline, so skip indentation.
+    return write_json(records, target, pretty=False)
 
 
 def _read_json(path: Path) -> List[OrderRecord]:
-    with path.open() as handle:
-        raw = json.load(handle)
-    return [OrderRecord(**row) for row in raw]
+    return [OrderRecord(**row) for row in read_json(path)]
 
 
 def write_bronze_orders(records: List[OrderRecord], lakehouse: LakehousePaths) -> Path:
@@ -69,17 +166,19 @@ def cleanse_orders(bronze_records: List[OrderRecord]) -> List[OrderRecord]:
         if key in seen:
             continue
         seen.add(key)
-        quantity = record.quantity if record.quantity > 0 else 1
-        unit_price = record.unit_price if record.unit_price >= 0 else 0.0
         if not record.user_id or not record.product_id or not record.order_ts:
             continue
+        if record.quantity > 0 and record.unit_price >= 0 and record.sales_channel:
+            # Already conformed: reuse the record rather than allocating a copy.
+            cleansed.append(record)
+            continue
         cleansed.append(
             OrderRecord(
                 order_id=record.order_id,
                 user_id=record.user_id,
                 product_id=record.product_id,
-                quantity=quantity,
-                unit_price=unit_price,
+                quantity=record.quantity if record.quantity > 0 else 1,
+                unit_price=record.unit_price if record.unit_price >= 0 else 0.0,
                 order_ts=record.order_ts,
                 sales_channel=record.sales_channel or "unknown",
             )
@@ -1,10 +1,10 @@
 """Association rule mining using a lightweight FP-Growth implementation."""
 from __future__ import annotations
 
-from collections import Counter
+from collections import Counter, defaultdict
 from dataclasses import dataclass
-from itertools import combinations
-from typing import Dict, List, Sequence, Tuple
+from functools import lru_cache
+from typing import Dict, List, Sequence, Set, Tuple
 
 from ..config import ModelConfig
 from ..data.ingestion import OrderRecord
@@ -25,12 +25,9 @@ class FPNode:
 
 
 def build_transactions(orders: Sequence[OrderRecord]) -> List[List[str]]:
-    transactions: Dict[str, List[str]] = {}
+    transactions: Dict[str, Set[str]] = defaultdict(set)
     for record in orders:
-        transactions.setdefault(record.order_id, [])
-        basket = transactions[record.order_id]
-        if record.product_id not in basket:
-            basket.append(record.product_id)
+        transactions[record.order_id].add(record.product_id)
     return [sorted(items) for items in transactions.values()]
 
 
@@ -46,12 +43,20 @@ def _link_header(header_table: Dict[str, Dict[str, object]], item: str, node: FP
 
 
 def build_fp_tree(
-    transactions: Sequence[Sequence[str]],
+    transactions: Sequence[Tuple[Sequence[str], int]],
     min_support_count: int,
 ) -> Tuple[FPNode, Dict[str, Dict[str, object]]]:
+    """Build an FP-tree from ``(items, multiplicity)`` pairs.
+
+    Conditional pattern bases carry the count of the node they were collected
+    from, so repeated paths are inserted once with their weight rather than
+    being expanded into duplicate transactions.
+    """
+
     item_counter: Counter[str] = Counter()
-    for transaction in transactions:
-        item_counter.update(transaction)
+    for transaction, count in transactions:
+        for item in transaction:
+            item_counter[item] += count
 
     frequent_items = {item for item, count in item_counter.items() if count >= min_support_count}
     header_table: Dict[str, Dict[str, object]] = {
@@ -59,21 +64,28 @@ def build_fp_tree(
         for item in frequent_items
     }
 
+    # Rank items once (descending support, then name) so each transaction is
+    # ordered by a plain int key instead of a per-comparison lambda.
+    rank = {
+        item: idx
+        for idx, item in enumerate(sorted(frequent_items, key=lambda item: (-item_counter[item], item)))
+    }
+
     root = FPNode(item=None, parent=None)
 
-    for transaction in transactions:
-        filtered = [item for item in transaction if item in frequent_items]
+    for transaction, count in transactions:
+        filtered = [item for item in transaction if item in rank]
         if not filtered:
             continue
-        sorted_items = sorted(filtered, key=lambda item: (-item_counter[item], item))
+        filtered.sort(key=rank.__getitem__)
         current = root
-        for item in sorted_items:
+        for item in filtered:
             if item not in current.children:
                 child = FPNode(item, current)
                 current.children[item] = child
                 _link_header(header_table, item, child)
             current = current.children[item]
-            current.increment(1)
+            current.increment(count)
 
     return root, header_table
 
@@ -94,30 +106,29 @@ def mine_tree(
     prefix: Tuple[str, ...],
     frequent_itemsets: Dict[Tuple[str, ...], int],
 ) -> None:
-    for item in sorted(header_table.keys(), key=lambda i: header_table[i]["support"]):
-        new_itemset = prefix + (item,)
-        support = header_table[item]["support"]
-        frequent_itemsets[new_itemset] = support  # type: ignore[arg-type]
-
-        conditional_patterns: List[Tuple[List[str], int]] = []
-        node: FPNode | None = header_table[item]["head"]  # type: ignore[assignment]
-        while node is not None:
-            path = ascend_path(node)
-            if path:
-                conditional_patterns.append((path, node.count))
-            node = node.link
-
-        if not conditional_patterns:
-            continue
-
-        transactions: List[List[str]] = []
-        for path, count in conditional_patterns:
-            for _ in range(count):
-                transactions.append(path)
-
-        _, conditional_header = build_fp_tree(transactions, min_support_count)
-        if conditional_header:
-            mine_tree(conditional_header, min_support_count, new_itemset, frequent_itemsets)
+    # Conditional trees are mined from an explicit stack of (prefix, header) frames
+    # instead of recursing once per frequent item.
+    stack: List[Tuple[Tuple[str, ...], Dict[str, Dict[str, object]]]] = [(prefix, header_table)]
+    while stack:
+        prefix, header_table = stack.pop()
+        for item in sorted(header_table.keys(), key=lambda i: header_table[i]["support"]):
+            new_itemset = prefix + (item,)
+            frequent_itemsets[new_itemset] = header_table[item]["support"]  # type: ignore[assignment]
+
+            conditional_patterns: List[Tuple[List[str], int]] = []
+            node: FPNode | None = header_table[item]["head"]  # type: ignore[assignment]
+            while node is not None:
+                path = ascend_path(node)
+                if path:
+                    conditional_patterns.append((path, node.count))
+                node = node.link
+
+            if not conditional_patterns:
+                continue
+
+            _, conditional_header = build_fp_tree(conditional_patterns, min_support_count)
+            if conditional_header:
+                stack.append((new_itemset, conditional_header))
 
 
 @dataclass
@@ -130,12 +141,31 @@ def generate_frequent_itemsets(transactions: List[List[str]], min_support: float
     if not transactions:
         return {}
     min_support_count = max(1, int(min_support * len(transactions)))
-    _, header_table = build_fp_tree(transactions, min_support_count)
+    _, header_table = build_fp_tree([(transaction, 1) for transaction in transactions], min_support_count)
     frequent_itemsets: Dict[Tuple[str, ...], int] = {}
     mine_tree(header_table, min_support_count, tuple(), frequent_itemsets)
     for item, entry in header_table.items():
         frequent_itemsets.setdefault((item,), entry["support"])  # type: ignore[arg-type]
-    return frequent_itemsets
+    # Canonical (sorted) keys let rule generation look up any subset directly.
+    return {tuple(sorted(itemset)): count for itemset, count in frequent_itemsets.items()}
+
+
+@lru_cache(maxsize=None)
+def _rule_splits(size: int) -> Tuple[Tuple[int, Tuple[int, ...], Tuple[int, ...]], ...]:
+    """All (mask, lhs positions, rhs positions) splits of an itemset of ``size`` items.
+
+    Bit ``i`` of ``mask`` puts position ``i`` in the antecedent; the consequent is the
+    complement. Computed once per size and ordered like ``combinations`` (smaller
+    antecedents first) so rule order is stable.
+    """
+    full = (1 << size) - 1
+    splits = []
+    for mask in range(1, full):
+        lhs_positions = tuple(i for i in range(size) if mask >> i & 1)
+        rhs_positions = tuple(i for i in range(size) if (full ^ mask) >> i & 1)
+        splits.append((mask, lhs_positions, rhs_positions))
+    splits.sort(key=lambda split: (len(split[1]), split[1]))
+    return tuple(splits)
 
 
 def generate_association_rules(
@@ -147,34 +177,46 @@ def generate_association_rules(
     rows: List[Dict[str, object]] = []
     if total_transactions == 0:
         return rows
-    support_lookup = {itemset: count / total_transactions for itemset, count in frequent_itemsets.items()}
     for itemset, support_count in frequent_itemsets.items():
         if len(itemset) < 2:
             continue
-        itemset_support = support_lookup[itemset]
-        for r in range(1, len(itemset)):
-            for lhs in combinations(itemset, r):
-                lhs = tuple(sorted(lhs))
-                rhs = tuple(sorted(set(itemset) - set(lhs)))
-                lhs_support = support_lookup.get(lhs)
-                rhs_support = support_lookup.get(rhs)
-                if lhs_support is None or rhs_support is None:
-                    continue
-                confidence = itemset_support / lhs_support if lhs_support else 0.0
-                if confidence < min_confidence:
-                    continue
-                lift = confidence / rhs_support if rhs_support else 0.0
-                if lift < min_lift:
-                    continue
-                rows.append(
-                    {
-                        "lhs": list(lhs),
-                        "rhs": list(rhs),
-                        "support": itemset_support,
-                        "confidence": confidence,
-                        "lift": lift,
-                    }
-                )
+        itemset_support = support_count / total_transactions
+        pick = itemset.__getitem__
+        # Confidence is anti-monotone in the antecedent: shrinking it can only raise its
+        # support, so once X -> Y misses min_confidence every split whose antecedent is
+        # a subset of X misses too. Walk larger antecedents first and skip those.
+        failed_masks: List[int] = []
+        accepted: List[Dict[str, object]] = []
+        for mask, lhs_positions, rhs_positions in reversed(_rule_splits(len(itemset))):
+            if any(mask & failed == mask for failed in failed_masks):
+                continue
+            lhs = tuple(map(pick, lhs_positions))
+            lhs_count = frequent_itemsets.get(lhs)
+            if not lhs_count:
+                continue
+            confidence = support_count / lhs_count
+            if confidence < min_confidence:
+                failed_masks.append(mask)
+                continue
+            rhs = tuple(map(pick, rhs_positions))
+            rhs_count = frequent_itemsets.get(rhs)
+            if not rhs_count:
+                continue
+            lift = confidence * total_transactions / rhs_count
+            if lift < min_lift:
+                continue
+            accepted.append(
+                {
+                    "lhs": list(lhs),
+                    "rhs": list(rhs),
+                    "support": itemset_support,
+                    "confidence": confidence,
+                    "lift": lift,
+                }
+            )
+        # Restore the smaller-antecedents-first order so tie-breaking in the final sort is unchanged.
+        accepted.reverse()
+        rows.extend(accepted)
     rows.sort(key=lambda row: (row["confidence"], row["support"]), reverse=True)
     return rows
 
@@ -195,10 +237,19 @@ def mine_rules(orders: Sequence[OrderRecord], config: ModelConfig) -> Associatio
         config.min_confidence,
         config.min_lift,
     )
-    rules = generate_association_rules(frequent_itemsets, len(transactions), config.min_confidence,  config.min_lift)
     return AssociationRuleResult(itemsets=itemsets, rules=rules)
 
 
+def index_rules_by_item(rules: List[Dict[str, object]]) -> Dict[str, List[Dict[str, object]]]:
+    """Map each product to the rules whose ``lhs`` contains it, preserving rule order."""
+    index: Dict[str, List[Dict[str, object]]] = defaultdict(list)
+    for rule in rules:
+        for product_id in rule["lhs"]:  # type: ignore[attr-defined]
+            index[product_id].append(rule)
+    return dict(index)
+
+
 def top_rules_for_item(rules: List[Dict[str, object]], product_id: str, top_k: int) -> List[Dict[str, object]]:
+    """One-off scan of ``rules``; repeated lookups should index once with :func:`index_rules_by_item`."""
     filtered = [rule for rule in rules if product_id in rule["lhs"]]
     return filtered[:top_k]
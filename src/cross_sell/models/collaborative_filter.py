@@ -1,83 +1,251 @@
 """Collaborative filtering via a pure Python Alternating Least Squares implementation."""
 from __future__ import annotations
 
+import heapq
 import random
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field
+from math import sqrt
+from operator import itemgetter, mul
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
 
 from ..config import ModelConfig
-from ..data.ingestion import OrderRecord
+from ..data.ingestion import OrderRecord, order_columns
 
 
 @dataclass
 class ALSArtifacts:
-    user_factors: List[List[float]]
-    item_factors: List[List[float]]
+    # Trained factor rows are packed as float32 arrays: a quarter of the memory of
+    # lists of Python floats, and plenty of precision for ranking.
+    user_factors: List[Sequence[float]]
+    item_factors: List[Sequence[float]]
     user_mapping: Dict[str, int]
     item_mapping: Dict[str, int]
+    # Euclidean norm of each item factor row, precomputed for cosine similarity.
+    item_norms: List[float] = field(default_factory=list)
+    # Index -> id lookups, the inverse of the mappings above.
+    inv_user_mapping: List[str] = field(default_factory=list)
+    inv_item_mapping: List[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if not self.item_norms:
+            self.item_norms = [sqrt(sum(map(mul, vector, vector))) for vector in self.item_factors]
+        if not self.inv_user_mapping:
+            self.inv_user_mapping = sorted(self.user_mapping, key=self.user_mapping.__getitem__)
+        if not self.inv_item_mapping:
+            self.inv_item_mapping = sorted(self.item_mapping, key=self.item_mapping.__getitem__)
+
+
+# Compressed sparse rows: for each row, the column indices of its nonzeros (ascending) and their values.
+SparseRows = List[Tuple[List[int], List[float]]]
+
+
+def _compress(cells: Dict[Tuple[int, int], float], num_rows: int) -> SparseRows:
+    rows: SparseRows = [([], []) for _ in range(num_rows)]
+    for (row, column), value in sorted(cells.items()):
+        indices, values = rows[row]
+        indices.append(column)
+        values.append(value)
+    return rows
 
 
 def build_interaction_matrix(
     orders: List[OrderRecord],
-) -> Tuple[List[List[float]], Dict[str, int], Dict[str, int]]:
-    users = sorted({record.user_id for record in orders})
-    items = sorted({record.product_id for record in orders})
-    user_index = {u: idx for idx, u in enumerate(users)}
-    item_index = {i: idx for idx, i in enumerate(items)}
-    matrix = [[0.0 for _ in items] for _ in users]
-    for record in orders:
-        matrix[user_index[record.user_id]][item_index[record.product_id]] += float(record.quantity)
-    return matrix, user_index, item_index
+) -> Tuple[SparseRows, SparseRows, Dict[str, int], Dict[str, int]]:
+    """Sparse user x item quantity matrix, returned row-wise and column-wise.
+
+    Only purchased (user, item) cells are stored, so memory is O(orders) rather
+    than O(users x items).
+    """
+    # Pull each column out once, then encode ids to dense codes with C-level map/zip.
+    user_ids, item_ids, quantities = order_columns(orders, "user_id", "product_id", "quantity")
+    users = sorted(set(user_ids))
+    items = sorted(set(item_ids))
+    user_index = dict(zip(users, range(len(users))))
+    item_index = dict(zip(items, range(len(items))))
+    cells: Dict[Tuple[int, int], float] = defaultdict(float)
+    codes = zip(map(user_index.__getitem__, user_ids), map(item_index.__getitem__, item_ids))
+    for cell, quantity in zip(codes, quantities):
+        cells[cell] += quantity
+    user_rows = _compress(cells, len(users))
+    item_rows = _compress({(item, user): value for (user, item), value in cells.items()}, len(items))
+    return user_rows, item_rows, user_index, item_index
+
+
+def _sparse_matmul(rows: SparseRows, right: List[List[float]]) -> Iterator[List[float]]:
+    """Yield the rows of sparse ``rows`` times dense ``right``, touching only stored nonzeros."""
+    num_columns = len(right[0]) if right else 0
+    for indices, values in rows:
+        if not indices:
+            yield [0.0] * num_columns
+            continue
+        selected = [right[index] for index in indices]
+        yield [sum(map(mul, values, column)) for column in zip(*selected)]
 
 
-def _transpose_multiply(matrix: List[List[float]]) -> List[List[float]]:
-    factors = len(matrix[0])
-    result = [[0.0 for _ in range(factors)] for _ in range(factors)]
-    for row in matrix:
-        for i in range(factors):
-            for j in range(factors):
-                result[i][j] += row[i] * row[j]
-    return result
+def _transpose(matrix: List[List[float]]) -> List[List[float]]:
+    return [list(column) for column in zip(*matrix)]
 
 
-def _vector_multiply(transpose: List[List[float]], vector: List[float]) -> List[float]:
-    return [sum(transpose[i][j] * vector[j] for j in range(len(vector))) for i in range(len(transpose))]
+def _matmul(left: List[List[float]], right_transposed: List[List[float]]) -> List[List[float]]:
+    """Multiply ``left`` by a matrix given as its transpose (i.e. as a list of columns)."""
+    return [[sum(map(mul, row, column)) for column in right_transposed] for row in left]
 
 
-def _add_regularization(matrix: List[List[float]], reg: float) -> List[List[float]]:
-    size = len(matrix)
-    return [[matrix[i][j] + (reg if i == j else 0.0) for j in range(size)] for i in range(size)]
+def _regularized_gram(factors: List[List[float]], reg: float) -> List[List[float]]:
+    columns = _transpose(factors)
+    gram = _matmul(columns, columns)
+    for i in range(len(gram)):
+        gram[i][i] += reg
+    return gram
 
 
-def _solve_linear_system(matrix: List[List[float]], vector: List[float]) -> List[float]:
+def _solve_many(matrix: List[List[float]], rhs_rows: List[List[float]]) -> List[List[float]]:
+    """Solve ``matrix @ x = b`` for every ``b`` in ``rhs_rows`` with one elimination.
+
+    Gauss-Jordan runs on ``matrix`` augmented with all right-hand sides at once, so
+    the shared system is reduced a single time per sweep instead of once per row.
+    """
     n = len(matrix)
-    # Build augmented matrix
-    aug = [row[:] + [vector[i]] for i, row in enumerate(matrix)]
+    aug = [row[:] + [rhs[i] for rhs in rhs_rows] for i, row in enumerate(matrix)]
     for i in range(n):
-        # Pivot selection
         pivot_row = max(range(i, n), key=lambda r: abs(aug[r][i]))
         if abs(aug[pivot_row][i]) < 1e-9:
             continue
         if pivot_row != i:
             aug[i], aug[pivot_row] = aug[pivot_row], aug[i]
         pivot = aug[i][i]
-        # Normalize pivot row
-        for j in range(i, n + 1):
-            aug[i][j] /= pivot
-        # Eliminate other rows
+        aug[i] = [value / pivot for value in aug[i]]
+        pivot_values = aug[i]
         for r in range(n):
             if r == i:
                 continue
             factor = aug[r][i]
-            for c in range(i, n + 1):
-                aug[r][c] -= factor * aug[i][c]
-    return [aug[i][n] for i in range(n)]
+            if factor:
+                aug[r] = [value - factor * p for value, p in zip(aug[r], pivot_values)]
+    return _transpose([row[n:] for row in aug])
+
+
+def _cholesky(matrix: List[List[float]]) -> List[List[float]] | None:
+    """Lower-triangular ``L`` with ``L @ L.T == matrix``, or None if not positive definite."""
+    n = len(matrix)
+    lower = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        row = lower[i]
+        for j in range(i + 1):
+            residual = matrix[i][j] - sum(map(mul, row[:j], lower[j][:j]))
+            if i == j:
+                if residual <= 0.0:
+                    return None
+                row[j] = sqrt(residual)
+            else:
+                row[j] = residual / lower[j][j]
+    return lower
 
 
-def train_als(orders: List[OrderRecord], config: ModelConfig) -> ALSArtifacts:
-    interactions, user_index, item_index = build_interaction_matrix(orders)
-    num_users = len(interactions)
-    num_items = len(interactions[0]) if interactions else 0
+def _cholesky_solve(lower: List[List[float]], rhs_rows: Iterable[List[float]]) -> List[List[float]]:
+    """Solve ``L @ L.T @ x = b`` for every ``b`` by forward then backward substitution."""
+    n = len(lower)
+    forward = [(row[:i], row[i]) for i, row in enumerate(lower)]
+    # Row i of L.T beyond the diagonal, reversed to line up with solutions built back to front.
+    backward = [([lower[j][i] for j in range(n - 1, i, -1)], lower[i][i]) for i in range(n - 1, -1, -1)]
+    solutions = []
+    for rhs in rhs_rows:
+        y: List[float] = []
+        for (coefficients, diagonal), value in zip(forward, rhs):
+            y.append((value - sum(map(mul, coefficients, y))) / diagonal)
+        x_reversed: List[float] = []
+        for (coefficients, diagonal), value in zip(backward, reversed(y)):
+            x_reversed.append((value - sum(map(mul, coefficients, x_reversed))) / diagonal)
+        x_reversed.reverse()
+        solutions.append(x_reversed)
+    return solutions
+
+
+def _als_half_step(rows: SparseRows, fixed_factors: List[List[float]], reg: float) -> List[List[float]]:
+    """Re-solve every factor row on one side of ALS while the other side is held fixed.
+
+    All rows share the same regularized Gram matrix, so it is factored once; each
+    row's right-hand side is then built from its nonzeros and substituted straight
+    away, without materializing the full right-hand-side matrix. Users and items
+    run through the same kernel with ``rows`` in user- or item-major order.
+    """
+    gram = _regularized_gram(fixed_factors, reg)
+    rhs_rows = _sparse_matmul(rows, fixed_factors)
+    # The regularized Gram matrix is SPD whenever reg > 0; otherwise fall back to elimination.
+    lower = _cholesky(gram)
+    if lower is None:
+        return _solve_many(gram, list(rhs_rows))
+    return _cholesky_solve(lower, rhs_rows)
+
+
+def _als_half_step_blocked(
+    rows: SparseRows,
+    fixed_factors: List[List[float]],
+    current_factors: List[List[float]],
+    reg: float,
+    block_size: int,
+) -> List[List[float]]:
+    """Subspace variant of :func:`_als_half_step` (iALS++, arXiv:2110.14044).
+
+    Factor dimensions are updated one block at a time, Gauss-Seidel style: each
+    block solves a ``block_size`` square system against the residual left by the
+    other, already current, blocks; a single block covering every dimension is
+    exactly the full solve. This ALS is unweighted, so :func:`_als_half_step`
+    already factors one shared Gram matrix per half-step and this variant brings
+    no speedup (it adds coupling work and converges more slowly per iteration).
+    It is a structural port for a future confidence-weighted, per-row variant.
+    """
+    gram = _regularized_gram(fixed_factors, 0.0)
+    rhs_rows = list(_sparse_matmul(rows, fixed_factors))
+    solution = [list(row) for row in current_factors]
+    num_factors = len(gram)
+    for start in range(0, num_factors, block_size):
+        stop = min(start + block_size, num_factors)
+        block = range(start, stop)
+        system = [[gram[i][j] + (reg if i == j else 0.0) for j in block] for i in block]
+        coupling = [gram[i][:start] + gram[i][stop:] for i in block]
+        block_rhs = [
+            [
+                rhs[i] - sum(map(mul, coupling_row, vector[:start] + vector[stop:]))
+                for i, coupling_row in zip(block, coupling)
+            ]
+            for rhs, vector in zip(rhs_rows, solution)
+        ]
+        lower = _cholesky(system)
+        block_solution = _solve_many(system, block_rhs) if lower is None else _cholesky_solve(lower, block_rhs)
+        for vector, values in zip(solution, block_solution):
+            vector[start:stop] = values
+    return solution
+
+
+def _seed_factors(
+    factors: List[List[float]],
+    index: Dict[str, int],
+    prior_factors: List[Sequence[float]],
+    prior_index: Dict[str, int],
+) -> None:
+    for key, idx in index.items():
+        prior_idx = prior_index.get(key)
+        if prior_idx is not None:
+            factors[idx] = list(prior_factors[prior_idx])
+
+
+def train_als(
+    orders: List[OrderRecord], config: ModelConfig, warm_start: ALSArtifacts | None = None
+) -> ALSArtifacts:
+    """Fit user and item factors to the order quantities.
+
+    ``warm_start`` seeds the factors of every user and item it already knows
+    from a previously trained model (matched by id, so the order sets may
+    differ); new ids start from the usual random initialization.
+    """
+    if config.als_use_ialspp and config.als_block_size < 1:
+        raise ValueError(f"als_block_size must be at least 1 when als_use_ialspp is set, got {config.als_block_size}")
+    user_rows, item_rows, user_index, item_index = build_interaction_matrix(orders)
+    num_users = len(user_rows)
+    num_items = len(item_rows)
     num_factors = config.als_factors
     if num_users == 0 or num_items == 0:
         return ALSArtifacts([], [], user_index, item_index)
@@ -85,70 +253,115 @@ def train_als(orders: List[OrderRecord], config: ModelConfig) -> ALSArtifacts:
     random.seed(42)
     user_factors = [[random.uniform(-0.1, 0.1) for _ in range(num_factors)] for _ in range(num_users)]
     item_factors = [[random.uniform(-0.1, 0.1) for _ in range(num_factors)] for _ in range(num_items)]
+    if warm_start is not None and warm_start.item_factors:
+        if len(warm_start.item_factors[0]) != num_factors:
+            raise ValueError(
+                f"warm_start has {len(warm_start.item_factors[0])} factors but config.als_factors is {num_factors}"
+            )
+        _seed_factors(user_factors, user_index, warm_start.user_factors, warm_start.user_mapping)
+        _seed_factors(item_factors, item_index, warm_start.item_factors, warm_start.item_mapping)
 
     reg = config.als_regularization
 
+    block_size = config.als_block_size
     for _ in range(config.als_iterations):
-        item_gram = _transpose_multiply(item_factors)
-        regularized_item_gram = _add_regularization(item_gram, reg)
-        for u in range(num_users):
-            user_interactions = interactions[u]
-            rhs = _vector_multiply([list(col) for col in zip(*item_factors)], user_interactions)
-            user_factors[u] = _solve_linear_system(regularized_item_gram, rhs)
-        user_gram = _transpose_multiply(user_factors)
-        regularized_user_gram = _add_regularization(user_gram, reg)
-        for i in range(num_items):
-            item_interactions = [interactions[u][i] for u in range(num_users)]
-            rhs = _vector_multiply([list(col) for col in zip(*user_factors)], item_interactions)
-            item_factors[i] = _solve_linear_system(regularized_user_gram, rhs)
+        if config.als_use_ialspp:
+            user_factors = _als_half_step_blocked(user_rows, item_factors, user_factors, reg, block_size)
+            item_factors = _als_half_step_blocked(item_rows, user_factors, item_factors, reg, block_size)
+        else:
+            user_factors = _als_half_step(user_rows, item_factors, reg)
+            item_factors = _als_half_step(item_rows, user_factors, reg)
 
     return ALSArtifacts(
-        user_factors=user_factors,
-        item_factors=item_factors,
+        user_factors=[array("f", row) for row in user_factors],
+        item_factors=[array("f", row) for row in item_factors],
         user_mapping=user_index,
         item_mapping=item_index,
     )
 
 
-def recommend_for_user(artifacts: ALSArtifacts, user_id: str, top_k: int) -> List[Dict[str, object]]:
-    if user_id not in artifacts.user_mapping or not artifacts.item_factors:
-        return []
-    user_idx = artifacts.user_mapping[user_id]
-    user_vector = artifacts.user_factors[user_idx]
-    scores = []
-    inv_item_mapping = {idx: item for item, idx in artifacts.item_mapping.items()}
-    for idx, item_vector in enumerate(artifacts.item_factors):
-        score = sum(u * v for u, v in zip(user_vector, item_vector))
-        scores.append((inv_item_mapping[idx], score))
-    scores.sort(key=lambda pair: pair[1], reverse=True)
+def _top_k(scores: Iterable[Tuple[str, float]], top_k: int) -> List[Tuple[str, float]]:
+    # A bounded heap is O(n log k) and breaks ties exactly like a stable descending sort.
+    return heapq.nlargest(top_k, scores, key=itemgetter(1))
+
+
+def _user_scores(artifacts: ALSArtifacts, user_vector: Sequence[float]) -> Iterable[Tuple[str, float]]:
+    scores = [sum(map(mul, user_vector, item_vector)) for item_vector in artifacts.item_factors]
+    return zip(artifacts.inv_item_mapping, scores)
+
+
+def _item_similarities(artifacts: ALSArtifacts, item_idx: int) -> Iterator[Tuple[str, float]]:
+    inv_item_mapping = artifacts.inv_item_mapping
+    target_vector = artifacts.item_factors[item_idx]
+    target_norm = artifacts.item_norms[item_idx]
+    for idx, (vector, norm) in enumerate(zip(artifacts.item_factors, artifacts.item_norms)):
+        if idx == item_idx:
+            continue
+        if target_norm == 0 or norm == 0:
+            yield inv_item_mapping[idx], 0.0
+        else:
+            yield inv_item_mapping[idx], sum(map(mul, target_vector, vector)) / (target_norm * norm)
+
+
+def _recommendation_rows(
+    artifacts: ALSArtifacts, user_id: str, user_vector: Sequence[float], top_k: int
+) -> List[Dict[str, object]]:
     return [
         {"user_id": user_id, "product_id": product_id, "score": score}
-        for product_id, score in scores[:top_k]
+        for product_id, score in _top_k(_user_scores(artifacts, user_vector), top_k)
     ]
 
 
+def recommend_for_user(artifacts: ALSArtifacts, user_id: str, top_k: int) -> List[Dict[str, object]]:
+    if user_id not in artifacts.user_mapping or not artifacts.item_factors:
+        return []
+    user_vector = artifacts.user_factors[artifacts.user_mapping[user_id]]
+    return _recommendation_rows(artifacts, user_id, user_vector, top_k)
+
+
+def recommend_for_users(
+    artifacts: ALSArtifacts, user_ids: Iterable[str], top_k: int
+) -> Dict[str, List[Dict[str, object]]]:
+    """:func:`recommend_for_user` for many users in one call, keyed by ``user_id``."""
+    if not artifacts.item_factors:
+        return {user_id: [] for user_id in user_ids}
+    batch: Dict[str, List[Dict[str, object]]] = {}
+    for user_id in user_ids:
+        user_idx = artifacts.user_mapping.get(user_id)
+        if user_idx is None:
+            batch[user_id] = []
+            continue
+        batch[user_id] = _recommendation_rows(artifacts, user_id, artifacts.user_factors[user_idx], top_k)
+    return batch
+
+
+def iter_recommendations(artifacts: ALSArtifacts, top_k: int) -> Iterator[Dict[str, object]]:
+    """Yield top-``top_k`` recommendation rows for every user, ordered by ``user_id``.
+
+    Equivalent to calling :func:`recommend_for_user` per user, but walks the
+    factor rows in index order instead of looking each user up. Rows are
+    produced lazily so they can be streamed to disk without being retained.
+    """
+    if not artifacts.item_factors:
+        return
+    for user_id, user_vector in zip(artifacts.inv_user_mapping, artifacts.user_factors):
+        yield from _recommendation_rows(artifacts, user_id, user_vector, top_k)
+
+
 def similar_items(artifacts: ALSArtifacts, product_id: str, top_k: int) -> List[Dict[str, object]]:
     if product_id not in artifacts.item_mapping or not artifacts.item_factors:
         return []
-    item_idx = artifacts.item_mapping[product_id]
-    target_vector = artifacts.item_factors[item_idx]
-    inv_item_mapping = {idx: item for item, idx in artifacts.item_mapping.items()}
-
-    def cosine_similarity(a: List[float], b: List[float]) -> float:
-        dot = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5
-        norm_b = sum(y * y for y in b) ** 0.5
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return dot / (norm_a * norm_b)
-
-    similarities = []
-    for idx, vector in enumerate(artifacts.item_factors):
-        if idx == item_idx:
-            continue
-        similarities.append((inv_item_mapping[idx], cosine_similarity(target_vector, vector)))
-    similarities.sort(key=lambda pair: pair[1], reverse=True)
+    similarities = _item_similarities(artifacts, artifacts.item_mapping[product_id])
     return [
         {"product_id": product_id, "similar_product_id": other, "score": score}
-        for other, score in similarities[:top_k]
+        for other, score in _top_k(similarities, top_k)
     ]
+
+
+def iter_similar_items(artifacts: ALSArtifacts, top_k: int) -> Iterator[Dict[str, object]]:
+    """Yield top-``top_k`` similar-item rows for every item, ordered by ``product_id``."""
+    if not artifacts.item_factors:
+        return
+    for item_idx, product_id in enumerate(artifacts.inv_item_mapping):
+        for other, score in _top_k(_item_similarities(artifacts, item_idx), top_k):
+            yield {"product_id": product_id, "similar_product_id": other, "score": score}
@@ -2,55 +2,137 @@
 from __future__ import annotations
 
 import csv
-from dataclasses import asdict
+import os
 from pathlib import Path
 from threading import Lock
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Tuple
+from uuid import uuid4
 
+from .._fastdict import record_asdict
 from ..data.ingestion import ProductRecord, read_products_csv
 
 
+_FIELDNAMES = ["product_id", "name", "category", "subcategory", "brand", "base_price"]
+
+
 class ProductStore:
-    """Simple CSV-backed product catalog store used by the demo UI."""
+    """Simple CSV-backed product catalog store used by the demo UI.
+
+    The catalog is read from disk once and served from memory afterwards,
+    reloading only when the file changes underneath us (mtime, size or inode).
+    Writes mutate the in-memory copy and are persisted by :meth:`flush`: net-new
+    products are appended to the CSV, and the file is rewritten only when an
+    already-persisted product changed.
+    """
 
     def __init__(self, path: Path) -> None:
         self.path = path
         self._lock = Lock()
+        self._by_id: Dict[str, ProductRecord] | None = None
+        self._stamp: Tuple[int, int, int] | None = None
+        # Pending changes: products new since the last flush, and whether any persisted row changed.
+        self._appended: Dict[str, ProductRecord] = {}
+        self._rewrite = False
+
+    def _disk_stamp(self) -> Tuple[int, int, int] | None:
+        # Size and inode catch same-tick rewrites on filesystems with coarse mtimes.
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _dirty(self) -> bool:
+        return self._rewrite or bool(self._appended)
+
+    def _catalog(self) -> Dict[str, ProductRecord]:
+        # Never reload over unflushed changes; they win over whatever is on disk.
+        if self._by_id is None or (not self._dirty() and self._disk_stamp() != self._stamp):
+            self._stamp = self._disk_stamp()
+            records = read_products_csv(self.path) if self._stamp is not None else []
+            self._by_id = {product.product_id: product for product in records}
+        return self._by_id
 
     def list_products(self) -> List[ProductRecord]:
-        if not self.path.exists():
-            return []
-        return read_products_csv(self.path)
+        with self._lock:
+            return list(self._catalog().values())
 
-    def upsert(self, record: ProductRecord) -> ProductRecord:
+    def _stage(self, record: ProductRecord) -> None:
+        catalog = self._catalog()
+        if record.product_id in self._appended or record.product_id not in catalog:
+            self._appended[record.product_id] = record
+        else:
+            self._rewrite = True
+        catalog[record.product_id] = record
+
+    def upsert(self, record: ProductRecord, flush: bool = True) -> ProductRecord:
         """Insert or update a product by ID.
 
-        The backing file is rewritten on every call to keep the implementation
-        straightforward and avoid partial writes.
+        Pass ``flush=False`` to defer the disk write (e.g. to a background task);
+        a burst of deferred upserts is then persisted by a single :meth:`flush`.
         """
 
         with self._lock:
-            current: Dict[str, ProductRecord] = {
-                product.product_id: product for product in self.list_products()
-            }
-            current[record.product_id] = record
-            self._write_all(current.values())
+            self._stage(record)
+        if flush:
+            self.flush()
         return record
 
+    def upsert_many(self, records: Iterable[ProductRecord]) -> List[ProductRecord]:
+        """Insert or update a batch of products, persisting them with one write."""
+
+        with self._lock:
+            staged = list(records)
+            for record in staged:
+                self._stage(record)
+        self.flush()
+        return staged
+
+    def flush(self) -> None:
+        """Persist pending changes; a no-op when nothing changed since the last flush."""
+
+        with self._lock:
+            if not self._dirty():
+                return
+            stamp = self._disk_stamp()
+            # A missing or empty file has no header row to append under.
+            if self._rewrite or stamp is None or stamp[1] == 0 or not self._append(self._appended.values()):
+                self._write_all(self._catalog().values())
+            self._appended = {}
+            self._rewrite = False
+            self._stamp = self._disk_stamp()
+
+    def _append(self, records: Iterable[ProductRecord]) -> bool:
+        """Append rows under the existing header; returns ``False`` if its columns differ from ours."""
+
+        with self.path.open("rb") as handle:
+            # Readers match columns by name, so a reordered header is valid but can't take our rows.
+            header = next(csv.reader([handle.readline().decode("utf-8", "replace")]), [])
+            if header != _FIELDNAMES:
+                return False
+            handle.seek(-1, os.SEEK_END)
+            terminated = handle.read(1) == b"\n"
+        with self.path.open("a", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=_FIELDNAMES)
+            if not terminated:
+                # Hand-edited files may lack a final newline; don't glue the new row onto the last one.
+                handle.write(writer.writer.dialect.lineterminator)
+            for record in records:
+                writer.writerow(record_asdict(record))
+        return True
+
     def _write_all(self, records: Iterable[ProductRecord]) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open("w", newline="") as handle:
-            writer = csv.DictWriter(
-                handle,
-                fieldnames=[
-                    "product_id",
-                    "name",
-                    "category",
-                    "subcategory",
-                    "brand",
-                    "base_price",
-                ],
-            )
-            writer.writeheader()
-            for record in records:
-                writer.writerow(asdict(record))
+        # Write to a sibling temp file and swap it in so readers never see a partial CSV.
+        # The staging name is unique per flush so concurrent processes never write into the same file.
+        staging = self.path.with_name(f"{self.path.name}.{os.getpid()}.{uuid4().hex}.tmp")
+        try:
+            with staging.open("x", newline="") as handle:
+                writer = csv.DictWriter(handle, fieldnames=_FIELDNAMES)
+                writer.writeheader()
+                for record in records:
+                    writer.writerow(record_asdict(record))
+            os.replace(staging, self.path)
+        except BaseException:
+            staging.unlink(missing_ok=True)
+            raise
@@ -1,44 +1,79 @@
 """Lightweight loader that surfaces product-to-product recommendations."""
 from __future__ import annotations
 
-import json
+from pathlib import Path
 from threading import Lock
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, List
 
 from ..config import LakehousePaths
+from ..data._io import read_json
 from ..data.gold import GOLD_TABLES
+from ..models.association_rules import index_rules_by_item
 
 
-class RecommendationIndex:
-    """Caches similarity results generated by the pipeline for fast lookup."""
+def _group_by_product(rows: Iterable[Dict[str, object]]) -> Dict[str, List[Dict[str, object]]]:
+    grouped: Dict[str, List[Dict[str, object]]] = {}
+    for row in rows:
+        product_id = row.get("product_id")
+        if product_id:
+            grouped.setdefault(product_id, []).append(row)  # type: ignore[arg-type]
+    return grouped
 
-    def __init__(self, lakehouse: LakehousePaths) -> None:
-        self._item_similarity_path = lakehouse.gold / GOLD_TABLES["item_similarity"]
-        self._lock = Lock()
-        self._cache: List[Dict[str, object]] = []
+
+class _GroupedGoldTable:
+    """A gold table held in memory as ``key -> rows`` and reloaded when the file changes."""
+
+    def __init__(
+        self,
+        path: Path,
+        group: Callable[[List[Dict[str, object]]], Dict[str, List[Dict[str, object]]]],
+    ) -> None:
+        self._path = path
+        self._group = group
+        self.groups: Dict[str, List[Dict[str, object]]] = {}
         self._stamp: float = -1.0
 
-    def _refresh_cache(self) -> None:
-        if not self._item_similarity_path.exists():
-            self._cache = []
+    def refresh(self) -> None:
+        if not self._path.exists():
+            self.groups = {}
             self._stamp = -1.0
             return
 
-        current_stamp = self._item_similarity_path.stat().st_mtime
+        current_stamp = self._path.stat().st_mtime
         if current_stamp == self._stamp:
             return
 
-        with self._item_similarity_path.open() as handle:
-            self._cache = json.load(handle)
+        self.groups = self._group(read_json(self._path))
         self._stamp = current_stamp
 
+
+class RecommendationIndex:
+    """Caches similarity and rule results generated by the pipeline for fast lookup.
+
+    Rows are grouped by product when a gold table is (re)loaded, so a lookup is
+    a dict access plus a slice rather than a scan of every row.
+    """
+
+    def __init__(self, lakehouse: LakehousePaths) -> None:
+        self._lock = Lock()
+        self._similarity = _GroupedGoldTable(lakehouse.gold / GOLD_TABLES["item_similarity"], _group_by_product)
+        self._rules = _GroupedGoldTable(lakehouse.gold / GOLD_TABLES["assoc_rules"], index_rules_by_item)
+
     def recommendations_for(self, product_id: str, limit: int) -> List[Dict[str, object]]:
         with self._lock:
-            self._refresh_cache()
-            rows = [row for row in self._cache if row.get("product_id") == product_id]
+            self._similarity.refresh()
+            rows = self._similarity.groups.get(product_id, [])
+        return rows[:limit]
+
+    def rules_for(self, product_id: str, limit: int) -> List[Dict[str, object]]:
+        """Return the strongest association rules whose antecedent contains ``product_id``."""
+
+        with self._lock:
+            self._rules.refresh()
+            rows = self._rules.groups.get(product_id, [])
         return rows[:limit]
 
     def available_products(self) -> List[str]:
         with self._lock:
-            self._refresh_cache()
-            return sorted({row.get("product_id") for row in self._cache if row.get("product_id")})
+            self._similarity.refresh()
+            return sorted(self._similarity.groups)
@@ -1,7 +1,7 @@
 """Metric utilities used for validating recommendation quality."""
 from __future__ import annotations
 
-from typing import Dict, Sequence, Set
+from typing import Dict, NamedTuple, Sequence, Set
 
 
 def precision_at_k(recommended: Sequence[str], relevant: Set[str], k: int) -> float:
@@ -87,3 +87,40 @@ def recall_mean_at_k(
     k: int,
 ) -> float:
     return mean_metric(recall_at_k, recommendations, ground_truth, k)
+
+
+class RankingMetrics(NamedTuple):
+    precision: float
+    recall: float
+    map: float
+
+
+def ranking_metrics_at_k(
+    recommendations: Dict[str, Sequence[str]],
+    ground_truth: Dict[str, Set[str]],
+    k: int,
+) -> RankingMetrics:
+    """Compute mean Precision@K, Recall@K and MAP@K together.
+
+    Equivalent to the three ``*_mean_at_k``/``map_at_k`` calls, but each user's
+    top-K list is scanned once and every hit feeds all three metrics.
+    """
+    if not ground_truth:
+        return RankingMetrics(0.0, 0.0, 0.0)
+    precision_total = recall_total = ap_total = 0.0
+    for user, relevant in ground_truth.items():
+        top_k = recommendations.get(user, [])[:k] if k > 0 else []
+        hits = 0
+        precision_sum = 0.0
+        for idx, item in enumerate(top_k, start=1):
+            if item in relevant:
+                hits += 1
+                precision_sum += hits / idx
+        if top_k:
+            precision_total += hits / len(top_k)
+        if relevant:
+            recall_total += hits / len(relevant)
+            if hits:
+                ap_total += precision_sum / len(relevant)
+    count = len(ground_truth)
+    return RankingMetrics(precision_total / count, recall_total / count, ap_total / count)
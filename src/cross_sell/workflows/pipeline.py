@@ -2,21 +2,25 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 from ..config import PipelineConfig
 from ..data import gold
+from ..data._io import WriteQueue
 from ..data.ingestion import (
     OrderRecord,
     cleanse_orders,
-    load_bronze_orders,
-    load_silver_orders,
     read_orders_csv,
     write_bronze_orders,
     write_silver_orders,
 )
 from ..models.association_rules import AssociationRuleResult, mine_rules
-from ..models.collaborative_filter import ALSArtifacts, recommend_for_user, similar_items, train_als
+from ..models.collaborative_filter import (
+    ALSArtifacts,
+    iter_recommendations,
+    iter_similar_items,
+    train_als,
+)
 
 
 @dataclass
@@ -26,6 +30,7 @@ class PipelineArtifacts:
     assoc_rules: List[Dict[str, object]]
     item_similarity: List[Dict[str, object]]
     user_recommendations: List[Dict[str, object]]
+    als_model: ALSArtifacts
 
     def __getitem__(self, item: str):
         return {
@@ -34,33 +39,37 @@ class PipelineArtifacts:
             "assoc_rules": self.assoc_rules,
             "item_similarity": self.item_similarity,
             "user_recommendations": self.user_recommendations,
+            "als_model": self.als_model,
         }[item]
 
 
 def run_pipeline(config: PipelineConfig) -> PipelineArtifacts:
     lakehouse = config.lakehouse
 
-    raw_orders = read_orders_csv(config.orders_source)
-    write_bronze_orders(raw_orders, lakehouse)
-    bronze_orders = load_bronze_orders(lakehouse)
-
-    cleansed_orders = cleanse_orders(bronze_orders)
-    write_silver_orders(cleansed_orders, lakehouse)
-    silver_orders = load_silver_orders(lakehouse)
+    # The CSV is parsed once and the records are carried through every stage; the
+    # JSON round trip is lossless, so reloading bronze/silver from disk would only
+    # re-parse what is already in memory. Table writes overlap with the modeling.
+    with WriteQueue() as table_writes:
+        bronze_orders = read_orders_csv(config.orders_source)
+        table_writes.submit(write_bronze_orders, bronze_orders, lakehouse)
 
-    assoc_result: AssociationRuleResult = mine_rules(silver_orders, config.model)
-    gold.write_gold_table(assoc_result.rules, lakehouse, "assoc_rules")
+        silver_orders = cleanse_orders(bronze_orders)
+        table_writes.submit(write_silver_orders, silver_orders, lakehouse)
 
-    als_artifacts: ALSArtifacts = train_als(silver_orders, config.model)
-    item_similarity = []
-    for product_id in sorted(als_artifacts.item_mapping.keys()):
-        item_similarity.extend(similar_items(als_artifacts, product_id, config.model.top_k))
-    gold.write_gold_table(item_similarity, lakehouse, "item_similarity")
+        assoc_result: AssociationRuleResult = mine_rules(silver_orders, config.model)
+        table_writes.submit(gold.write_gold_table, assoc_result.rules, lakehouse, "assoc_rules")
 
-    user_recommendations = []
-    for user_id in sorted(als_artifacts.user_mapping.keys()):
-        user_recommendations.extend(recommend_for_user(als_artifacts, user_id, config.model.top_k))
-    gold.write_gold_table(user_recommendations, lakehouse, "user_recs")
+        als_artifacts: ALSArtifacts = train_als(silver_orders, config.model)
+        similarity_rows: Iterable[Dict[str, object]] = iter_similar_items(als_artifacts, config.model.top_k)
+        recommendation_rows: Iterable[Dict[str, object]] = iter_recommendations(als_artifacts, config.model.top_k)
+        item_similarity: List[Dict[str, object]] = []
+        user_recommendations: List[Dict[str, object]] = []
+        if config.keep_gold_rows:
+            similarity_rows = item_similarity = list(similarity_rows)
+            recommendation_rows = user_recommendations = list(recommendation_rows)
+        # Otherwise the writer threads drain the generators one row at a time.
+        table_writes.submit(gold.write_gold_table, similarity_rows, lakehouse, "item_similarity")
+        table_writes.submit(gold.write_gold_table, recommendation_rows, lakehouse, "user_recs")
 
     return PipelineArtifacts(
         bronze_orders=bronze_orders,
@@ -68,4 +77,5 @@ def run_pipeline(config: PipelineConfig) -> PipelineArtifacts:
         assoc_rules=assoc_result.rules,
         item_similarity=item_similarity,
         user_recommendations=user_recommendations,
+        als_model=als_artifacts,
     )
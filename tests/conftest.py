@@ -1,4 +1,30 @@
 import sys
 from pathlib import Path
+from typing import Tuple
+
+import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from cross_sell.config import ModelConfig, PipelineConfig  # noqa: E402
+from cross_sell.workflows.pipeline import PipelineArtifacts, run_pipeline  # noqa: E402
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # Modules that consume ``pipeline_run`` are marked ``xdist_group("pipeline")`` so that
+    # ``pytest -n auto --dist loadgroup`` keeps them on one worker and the pipeline runs
+    # once there. Registered here so the marker is known without pytest-xdist installed.
+    config.addinivalue_line("markers", "xdist_group(name): run tests of the same group on one xdist worker")
+
+
+@pytest.fixture(scope="session")
+def pipeline_run(tmp_path_factory: pytest.TempPathFactory) -> Tuple[PipelineConfig, PipelineArtifacts]:
+    """One full pipeline run over the sample orders, shared by every test module."""
+    lakehouse_root = tmp_path_factory.mktemp("lakehouse")
+    config = PipelineConfig(
+        lakehouse_root=lakehouse_root,
+        orders_source=Path("data/sample_orders.csv"),
+        model=ModelConfig(min_support=0.1, min_confidence=0.3, min_lift=1.1, top_k=5),
+    )
+    artifacts = run_pipeline(config)
+    return config, artifacts
@@ -33,6 +33,12 @@ def api_client(tmp_path, monkeypatch):
     ]
     with (gold_dir / "item_similarity.json").open("w") as handle:
         json.dump(sample_similarity, handle)
+    sample_rules = [
+        {"lhs": ["SKU-1", "SKU-2"], "rhs": ["SKU-3"], "support": 0.2, "confidence": 0.8, "lift": 1.5},
+        {"lhs": ["SKU-1"], "rhs": ["SKU-2"], "support": 0.3, "confidence": 0.6, "lift": 1.2},
+    ]
+    with (gold_dir / "assoc_rules.json").open("w") as handle:
+        json.dump(sample_rules, handle)
 
     monkeypatch.setenv("PRODUCT_STORE_PATH", str(product_path))
     monkeypatch.setenv("LAKEHOUSE_ROOT", str(lakehouse_root))
@@ -78,7 +84,29 @@ def test_api_product_crud_and_recommendations(api_client: TestClient):
     assert payload["recommendations"][0]["similar_product_id"] == "SKU-2"
 
 
+def test_api_rules_for_product(api_client: TestClient):
+    response = api_client.get("/api/rules/SKU-1", params={"limit": 1})
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["product_id"] == "SKU-1"
+    assert [rule["rhs"] for rule in payload["rules"]] == [["SKU-3"]]
+
+    assert api_client.get("/api/rules/SKU-2").json()["rules"][0]["rhs"] == ["SKU-3"]
+    assert api_client.get("/api/rules/SKU-9").json()["rules"] == []
+
+
 def test_limit_validation(api_client: TestClient):
     response = api_client.get("/api/recommendations/SKU-1", params={"limit": 0})
     assert response.status_code == 400
     assert response.json()["detail"] == "limit must be positive"
+
+
+def test_index_renders_catalog(api_client: TestClient):
+    api_client.post(
+        "/api/products",
+        json={"product_id": "SKU-9", "name": "Docking Station", "category": "Accessories"},
+    )
+
+    response = api_client.get("/")
+    assert response.status_code == 200
+    assert "Docking Station" in response.text
@@ -0,0 +1,40 @@
+from unittest import mock
+
+from cross_sell.config import ModelConfig
+from cross_sell.data.ingestion import OrderRecord
+from cross_sell.models import association_rules
+
+
+def _order(order_id: str, product_id: str) -> OrderRecord:
+    return OrderRecord(
+        order_id=order_id,
+        user_id="U001",
+        product_id=product_id,
+        quantity=1,
+        unit_price=1.0,
+        order_ts="2024-01-01T00:00:00Z",
+        sales_channel="online",
+    )
+
+
+def test_mine_rules_generates_rules_once() -> None:
+    orders = [
+        _order("1", "P001"),
+        _order("1", "P002"),
+        _order("2", "P001"),
+        _order("2", "P002"),
+        _order("3", "P003"),
+    ]
+
+    with mock.patch.object(
+        association_rules,
+        "generate_association_rules",
+        wraps=association_rules.generate_association_rules,
+    ) as spy:
+        result = association_rules.mine_rules(orders, ModelConfig(min_support=0.3, min_confidence=0.5))
+
+    assert spy.call_count == 1
+    assert {(tuple(rule["lhs"]), tuple(rule["rhs"])) for rule in result.rules} == {
+        (("P001",), ("P002",)),
+        (("P002",), ("P001",)),
+    }
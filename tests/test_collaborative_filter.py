@@ -0,0 +1,65 @@
+from collections import defaultdict
+from dataclasses import replace
+from operator import mul
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+from cross_sell.config import ModelConfig
+from cross_sell.data.ingestion import OrderRecord, cleanse_orders, read_orders_csv
+from cross_sell.models.collaborative_filter import ALSArtifacts, train_als
+
+
+def _training_loss(orders: List[OrderRecord], model: ALSArtifacts, reg: float) -> float:
+    quantities: Dict[Tuple[str, str], float] = defaultdict(float)
+    for record in orders:
+        quantities[record.user_id, record.product_id] += record.quantity
+    error = sum(
+        (quantities.get((user_id, product_id), 0.0) - sum(map(mul, model.user_factors[u], model.item_factors[i]))) ** 2
+        for user_id, u in model.user_mapping.items()
+        for product_id, i in model.item_mapping.items()
+    )
+    penalty = sum(x * x for vector in (*model.user_factors, *model.item_factors) for x in vector)
+    return error + reg * penalty
+
+
+def test_ialspp_single_block_matches_full_solve() -> None:
+    orders = cleanse_orders(read_orders_csv(Path("data/sample_orders.csv")))
+
+    full = train_als(orders, ModelConfig(als_factors=4))
+    blocked = train_als(orders, ModelConfig(als_factors=4, als_use_ialspp=True, als_block_size=4))
+
+    assert blocked.user_factors == full.user_factors
+    assert blocked.item_factors == full.item_factors
+
+
+def test_ialspp_multi_block_converges_like_full_solve() -> None:
+    orders = cleanse_orders(read_orders_csv(Path("data/sample_orders.csv")))
+    config = ModelConfig(als_factors=4, als_iterations=30)
+
+    full = train_als(orders, config)
+    split = train_als(orders, replace(config, als_use_ialspp=True, als_block_size=2))
+
+    reg = config.als_regularization
+    assert _training_loss(orders, split, reg) <= 1.05 * _training_loss(orders, full, reg)
+
+
+@pytest.mark.parametrize("block_size", [0, -1])
+def test_ialspp_rejects_non_positive_block_size(block_size: int) -> None:
+    orders = cleanse_orders(read_orders_csv(Path("data/sample_orders.csv")))
+
+    with pytest.raises(ValueError, match="als_block_size"):
+        train_als(orders, ModelConfig(als_use_ialspp=True, als_block_size=block_size))
+
+
+def test_warm_start_reuses_known_factors() -> None:
+    orders = cleanse_orders(read_orders_csv(Path("data/sample_orders.csv")))
+    trained = train_als(orders, ModelConfig())
+
+    resumed = train_als(orders[1:], ModelConfig(als_iterations=0), warm_start=trained)
+
+    for user_id, idx in resumed.user_mapping.items():
+        assert resumed.user_factors[idx] == trained.user_factors[trained.user_mapping[user_id]]
+    for product_id, idx in resumed.item_mapping.items():
+        assert resumed.item_factors[idx] == trained.item_factors[trained.item_mapping[product_id]]
@@ -1,15 +1,17 @@
+from dataclasses import replace
 from pathlib import Path
+from typing import Tuple
+
+import pytest
 
 from cross_sell.config import PipelineConfig
-from cross_sell.workflows.pipeline import run_pipeline
+from cross_sell.workflows.pipeline import PipelineArtifacts, run_pipeline
+
+pytestmark = pytest.mark.xdist_group("pipeline")
 
 
-def test_pipeline_produces_gold_tables(tmp_path: Path) -> None:
-    config = PipelineConfig(
-        lakehouse_root=tmp_path / "lakehouse",
-        orders_source=Path("data/sample_orders.csv"),
-    )
-    artifacts = run_pipeline(config)
+def test_pipeline_produces_gold_tables(pipeline_run: Tuple[PipelineConfig, PipelineArtifacts]) -> None:
+    config, artifacts = pipeline_run
 
     assert artifacts["assoc_rules"], "Expected association rules"
     assert artifacts["item_similarity"], "Expected item similarity rows"
@@ -19,3 +21,15 @@ def test_pipeline_produces_gold_tables(tmp_path: Path) -> None:
     assert (gold_dir / "assoc_rules.json").exists()
     assert (gold_dir / "item_similarity.json").exists()
     assert (gold_dir / "user_recommendations.json").exists()
+
+
+def test_pipeline_streams_gold_tables(
+    pipeline_run: Tuple[PipelineConfig, PipelineArtifacts], tmp_path: Path
+) -> None:
+    retained, _ = pipeline_run
+    streamed = replace(retained, lakehouse_root=tmp_path / "streamed", keep_gold_rows=False)
+    artifacts = run_pipeline(streamed)
+
+    assert artifacts.user_recommendations == []
+    for name in ("item_similarity.json", "user_recommendations.json"):
+        assert (streamed.lakehouse.gold / name).read_bytes() == (retained.lakehouse.gold / name).read_bytes()
@@ -1,3 +1,4 @@
+from dataclasses import replace
 from pathlib import Path
 
 from cross_sell.data.ingestion import ProductRecord
@@ -49,3 +50,133 @@ def test_product_store_upsert_overwrites(tmp_path: Path) -> None:
     stored = store.list_products()
     assert len(stored) == 1
     assert stored[0] == updated
+
+
+def test_product_store_deferred_flush(tmp_path: Path) -> None:
+    path = tmp_path / "products.csv"
+    store = ProductStore(path)
+    record = ProductRecord(
+        product_id="sku-1",
+        name="Widget",
+        category="Accessories",
+        subcategory="Cables",
+        brand="Contoso",
+        base_price=12.34,
+    )
+
+    store.upsert(record, flush=False)
+    assert store.list_products() == [record]
+    assert not path.exists()
+
+    store.flush()
+    assert ProductStore(path).list_products() == [record]
+
+
+def test_product_store_appends_and_reloads(tmp_path: Path) -> None:
+    path = tmp_path / "products.csv"
+    store = ProductStore(path)
+    records = [
+        ProductRecord(
+            product_id=f"sku-{idx}",
+            name=f"Widget {idx}",
+            category="Accessories",
+            subcategory="Cables",
+            brand="Contoso",
+            base_price=float(idx),
+        )
+        for idx in range(3)
+    ]
+
+    store.upsert_many(records[:2])
+    store.upsert(records[2])
+    assert path.read_text().count("product_id") == 1
+    assert ProductStore(path).list_products() == records
+
+    other = ProductStore(path)
+    renamed = ProductRecord(
+        product_id="sku-0",
+        name="Widget Zero",
+        category="Accessories",
+        subcategory="Cables",
+        brand="Contoso",
+        base_price=0.0,
+    )
+    other.upsert(renamed)
+    assert store.list_products() == [renamed, *records[1:]]
+
+
+def test_product_store_upsert_into_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "products.csv"
+    path.touch()
+    store = ProductStore(path)
+    record = ProductRecord(
+        product_id="sku-1",
+        name="Widget",
+        category="Accessories",
+        subcategory="Cables",
+        brand="Contoso",
+        base_price=12.34,
+    )
+
+    store.upsert(record)
+
+    assert ProductStore(path).list_products() == [record]
+
+
+def test_product_store_append_without_trailing_newline(tmp_path: Path) -> None:
+    path = tmp_path / "products.csv"
+    path.write_text("product_id,name,category,subcategory,brand,base_price\nsku-0,Cable,Accessories,Cables,Contoso,1.0")
+    store = ProductStore(path)
+    record = ProductRecord(
+        product_id="sku-1",
+        name="Widget",
+        category="Accessories",
+        subcategory="Cables",
+        brand="Contoso",
+        base_price=12.34,
+    )
+
+    store.upsert(record)
+
+    assert [product.product_id for product in ProductStore(path).list_products()] == ["sku-0", "sku-1"]
+    assert ProductStore(path).list_products()[1] == record
+
+
+def test_product_store_append_with_reordered_header(tmp_path: Path) -> None:
+    path = tmp_path / "products.csv"
+    path.write_text("name,product_id,category,subcategory,brand,base_price\nCable,sku-0,Accessories,Cables,Contoso,1.0\n")
+    store = ProductStore(path)
+    record = ProductRecord(
+        product_id="sku-1",
+        name="Widget",
+        category="Accessories",
+        subcategory="Cables",
+        brand="Contoso",
+        base_price=12.34,
+    )
+
+    store.upsert(record)
+
+    products = ProductStore(path).list_products()
+    assert [product.product_id for product in products] == ["sku-0", "sku-1"]
+    assert products[0].name == "Cable"
+    assert products[1] == record
+
+
+def test_product_store_rewrite_leaves_no_staging_files(tmp_path: Path) -> None:
+    path = tmp_path / "products.csv"
+    store = ProductStore(path)
+    record = ProductRecord(
+        product_id="sku-1",
+        name="Widget",
+        category="Accessories",
+        subcategory="Cables",
+        brand="Contoso",
+        base_price=12.34,
+    )
+
+    store.upsert(record)
+    store.upsert(replace(record, name="Widget Pro"))
+
+    assert [child.name for child in tmp_path.iterdir()] == ["products.csv"]
+    assert ProductStore(path).list_products()[0].name == "Widget Pro"
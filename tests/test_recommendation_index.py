@@ -0,0 +1,38 @@
+import json
+from pathlib import Path
+
+from cross_sell.config import LakehousePaths
+from cross_sell.service.recommendation_index import RecommendationIndex
+
+
+def _write(path: Path, rows) -> None:
+    with path.open("w") as handle:
+        json.dump(rows, handle)
+
+
+def test_recommendation_index_groups_similarity_and_rules(tmp_path: Path) -> None:
+    lakehouse = LakehousePaths(tmp_path / "lakehouse")
+    _write(
+        lakehouse.gold / "item_similarity.json",
+        [
+            {"product_id": "P1", "similar_product_id": "P2", "score": 0.9},
+            {"product_id": "P2", "similar_product_id": "P1", "score": 0.9},
+            {"product_id": "P1", "similar_product_id": "P3", "score": 0.4},
+        ],
+    )
+    _write(
+        lakehouse.gold / "assoc_rules.json",
+        [
+            {"lhs": ["P1", "P2"], "rhs": ["P3"], "support": 0.2, "confidence": 0.8, "lift": 1.5},
+            {"lhs": ["P1"], "rhs": ["P2"], "support": 0.3, "confidence": 0.6, "lift": 1.2},
+        ],
+    )
+    index = RecommendationIndex(lakehouse)
+
+    assert [row["similar_product_id"] for row in index.recommendations_for("P1", 5)] == ["P2", "P3"]
+    assert index.recommendations_for("P9", 5) == []
+    assert index.available_products() == ["P1", "P2"]
+
+    assert [rule["rhs"] for rule in index.rules_for("P1", 5)] == [["P3"], ["P2"]]
+    assert [rule["rhs"] for rule in index.rules_for("P2", 5)] == [["P3"]]
+    assert index.rules_for("P1", 1) == index.rules_for("P1", 5)[:1]
@@ -1,43 +1,33 @@
 from __future__ import annotations
 
+import mmap
 from collections import defaultdict
+from operator import attrgetter, itemgetter
 from pathlib import Path
 from typing import Dict, List, Sequence, Set, Tuple
 
 import pytest
 
-from cross_sell.config import ModelConfig, PipelineConfig
-from cross_sell.data.ingestion import OrderRecord, read_orders_csv
-from cross_sell.models.collaborative_filter import recommend_for_user, train_als
+from cross_sell.config import PipelineConfig
+from cross_sell.data.ingestion import OrderRecord, order_columns
+from cross_sell.models.collaborative_filter import recommend_for_users, train_als
 from cross_sell.validation.metrics import (
     map_at_k,
     precision_mean_at_k,
+    ranking_metrics_at_k,
     recall_mean_at_k,
 )
-from cross_sell.workflows.pipeline import PipelineArtifacts, run_pipeline
+from cross_sell.workflows.pipeline import PipelineArtifacts
 
-
-@pytest.fixture(scope="module")
-def pipeline_run(tmp_path_factory: pytest.TempPathFactory) -> Tuple[PipelineConfig, PipelineArtifacts]:
-    lakehouse_root = tmp_path_factory.mktemp("lakehouse")
-    config = PipelineConfig(
-        lakehouse_root=lakehouse_root,
-        orders_source=Path("data/sample_orders.csv"),
-        model=ModelConfig(min_support=0.1, min_confidence=0.3, min_lift=1.1, top_k=5),
-    )
-    artifacts = run_pipeline(config)
-    return config, artifacts
+pytestmark = pytest.mark.xdist_group("pipeline")
 
 
 def _assert_order_record_schema(records: Sequence[OrderRecord]) -> None:
-    for record in records:
-        assert record.order_id
-        assert record.user_id
-        assert record.product_id
-        assert record.quantity > 0
-        assert record.unit_price >= 0
-        assert record.order_ts
-        assert record.sales_channel
+    required = attrgetter("order_id", "user_id", "product_id", "order_ts", "sales_channel")
+    assert all(map(all, map(required, records)))
+    quantities, unit_prices = order_columns(records, "quantity", "unit_price")
+    assert not quantities or min(quantities) > 0
+    assert not unit_prices or min(unit_prices) >= 0
 
 
 def test_bronze_and_silver_quality(pipeline_run: Tuple[PipelineConfig, PipelineArtifacts]) -> None:
@@ -45,7 +35,7 @@ def test_bronze_and_silver_quality(pipeline_run: Tuple[PipelineConfig, PipelineA
     _assert_order_record_schema(artifacts.bronze_orders)
     _assert_order_record_schema(artifacts.silver_orders)
 
-    dedup_keys = {(row.order_id, row.product_id) for row in artifacts.silver_orders}
+    dedup_keys = set(map(attrgetter("order_id", "product_id"), artifacts.silver_orders))
     assert len(dedup_keys) == len(artifacts.silver_orders)
 
 
@@ -54,10 +44,10 @@ def test_association_rules_quality(pipeline_run: Tuple[PipelineConfig, PipelineA
     rules = artifacts.assoc_rules
     assert rules, "Expected association rules to be generated"
 
-    for rule in rules:
-        assert rule["support"] >= config.model.min_support - 1e-6
-        assert 0.0 < rule["confidence"] <= 1.0
-        assert rule["lift"] >= config.model.min_lift
+    supports, confidences, lifts = zip(*map(itemgetter("support", "confidence", "lift"), rules))
+    assert min(supports) >= config.model.min_support - 1e-6
+    assert 0.0 < min(confidences) and max(confidences) <= 1.0
+    assert min(lifts) >= config.model.min_lift
 
 
 def _build_holdout_sets(orders: Sequence[OrderRecord]) -> Tuple[List[OrderRecord], Dict[str, Set[str]]]:
@@ -67,37 +57,56 @@ def _build_holdout_sets(orders: Sequence[OrderRecord]) -> Tuple[List[OrderRecord
 
     train_records: List[OrderRecord] = []
     holdout: Dict[str, Set[str]] = {}
+    order_ts = attrgetter("order_ts")
     for user_id, user_orders in per_user.items():
-        sorted_orders = sorted(user_orders, key=lambda r: r.order_ts)
-        if len(sorted_orders) <= 1:
-            train_records.extend(sorted_orders)
+        if len(user_orders) <= 1:
+            train_records.extend(user_orders)
             continue
-        holdout_record = sorted_orders[-1]
-        train_records.extend(sorted_orders[:-1])
+        # Scanning in reverse makes ties resolve to the last of equally-timestamped orders.
+        holdout_record = max(reversed(user_orders), key=order_ts)
+        train_records.extend(record for record in user_orders if record is not holdout_record)
         holdout[user_id] = {holdout_record.product_id}
     return train_records, holdout
 
 
 def test_collaborative_filter_metrics(pipeline_run: Tuple[PipelineConfig, PipelineArtifacts]) -> None:
-    config, _ = pipeline_run
-    orders = read_orders_csv(config.orders_source)
-    train_records, holdout = _build_holdout_sets(orders)
+    config, artifacts = pipeline_run
+    # Bronze orders are the parsed CSV as-is; reuse them rather than decoding the file again.
+    train_records, holdout = _build_holdout_sets(artifacts.bronze_orders)
     als_model = train_als(train_records, config.model)
 
-    recommendations: Dict[str, List[str]] = {}
-    for user_id in holdout.keys():
-        recs = recommend_for_user(als_model, user_id, config.model.top_k)
-        recommendations[user_id] = [row["product_id"] for row in recs]
+    recommendations: Dict[str, List[str]] = {
+        user_id: [row["product_id"] for row in recs]
+        for user_id, recs in recommend_for_users(als_model, holdout, config.model.top_k).items()
+    }
 
-    precision = precision_mean_at_k(recommendations, holdout, config.model.top_k)
-    recall = recall_mean_at_k(recommendations, holdout, config.model.top_k)
-    map_score = map_at_k(recommendations, holdout, config.model.top_k)
+    precision, recall, map_score = ranking_metrics_at_k(recommendations, holdout, config.model.top_k)
 
     assert 0.1 <= precision <= 1.0
     assert 0.5 <= recall <= 1.0
     assert 0.2 <= map_score <= 1.0
 
 
+_JSON_WHITESPACE = b" \t\r\n"
+
+
+def _json_edges(path: Path) -> Tuple[bytes, bytes]:
+    """First and last non-whitespace bytes of ``path``.
+
+    The file is memory-mapped, so only the pages actually inspected at either end
+    are faulted in, whatever the table size.
+    """
+    if path.stat().st_size == 0:
+        return b"", b""
+    with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        start, end = 0, len(view) - 1
+        while start <= end and view[start] in _JSON_WHITESPACE:
+            start += 1
+        while end >= start and view[end] in _JSON_WHITESPACE:
+            end -= 1
+        return view[start : start + 1], view[end : end + 1]
+
+
 def test_gold_outputs_align_with_serving_tables(
     pipeline_run: Tuple[PipelineConfig, PipelineArtifacts]
 ) -> None:
@@ -106,5 +115,16 @@ def test_gold_outputs_align_with_serving_tables(
     for name in ["assoc_rules.json", "item_similarity.json", "user_recommendations.json"]:
         path = gold_dir / name
         assert path.exists(), f"Missing gold table {name}"
-        data = path.read_text().strip()
-        assert data.startswith("[") and data.endswith("]"), f"Unexpected format for {name}"
+        assert _json_edges(path) == (b"[", b"]"), f"Unexpected format for {name}"
+
+
+def test_ranking_metrics_match_individual_metrics() -> None:
+    recommendations = {"u1": ["a", "b", "c"], "u2": ["c", "d"], "u3": []}
+    ground_truth = {"u1": {"b", "z"}, "u2": {"c", "d"}, "u3": {"a"}, "u4": set()}
+
+    for k in (1, 2, 3):
+        assert ranking_metrics_at_k(recommendations, ground_truth, k) == (
+            precision_mean_at_k(recommendations, ground_truth, k),
+            recall_mean_at_k(recommendations, ground_truth, k),
+            map_at_k(recommendations, ground_truth, k),
+        )